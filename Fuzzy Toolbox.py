@@ -25,6 +25,7 @@ def main():
                 print("2- Add fuzzy sets to an existing variable.")
                 print("3- Add rules.")
                 print("4- Run the simulation on crisp values.")
+                print("5- Optimize the rules.")
 
                 choice = input()
 
@@ -128,13 +129,34 @@ def main():
                         print("-----------------------")
                         for variable in fuzzy_system.variables.values():
                             if variable.type == 'IN':
-                                print(f"{variable.name} = ", end='')
-                                crisp_values[variable.name] = float(input())
+                                while True:
+                                    print(f"{variable.name} = ", end='')
+                                    try:
+                                        value = float(input())
+                                        lower, upper = variable.range
+                                        if not lower <= value <= upper:
+                                            raise ValueError(f"Expected a value within [{lower}, {upper}].")
+                                        crisp_values[variable.name] = value
+                                        break
+                                    except ValueError as e:
+                                        print(f"Invalid input. {str(e)} Please try again.")
                         fuzzy_system.run_simulation(crisp_values)
 
                     else:
                         print("CAN’T START THE SIMULATION! Please add the fuzzy sets and rules first.")
 
+                elif choice == '5':
+                    if fuzzy_system.rules:
+                        report = fuzzy_system.optimize_rules()
+                        print(f"Merged {len(report['duplicate'])} duplicate rule(s): {report['duplicate']}")
+                        print(f"Removed {len(report['dead'])} dead rule(s): {report['dead']}")
+                        for rule, other in report['dominated']:
+                            print(f"Rule {rule} is dominated by rule {other}")
+                        for term, uses in report['shared']:
+                            print(f"Shared '{term}' ({uses} uses)")
+                    else:
+                        print("There are no rules to optimize! Please add the rules first.")
+
                 elif choice.lower() == 'close':
                     break
 
@@ -107,6 +107,8 @@ class FuzzyRule:
         The antecedent of the fuzzy rule.
     consequent: tuple
         The consequent of the fuzzy rule.
+    weight: int
+        The number of identical rules this rule stands for.
 
     Attributes:
     -----------
@@ -114,7 +116,28 @@ class FuzzyRule:
         The antecedent of the fuzzy rule.
     consequent: tuple
         The consequent of the fuzzy rule.
+    weight: int
+        The number of identical rules this rule stands for.
     """
-    def __init__(self, antecedent, consequent):
+    def __init__(self, antecedent, consequent, weight=1):
+        self.antecedent = antecedent
+        self.consequent = consequent
+        self.weight = weight
+
+
+class FuzzyTerm:
+    """
+    This class represents an "and" sub-expression shared by several Fuzzy Rules.
+
+    Parameters:
+    -----------
+    antecedent: list
+        The shared part of the antecedent.
+
+    Attributes:
+    -----------
+    antecedent: list
+        The shared part of the antecedent.
+    """
+    def __init__(self, antecedent):
         self.antecedent = antecedent
-        self.consequent = consequent
\ No newline at end of file
@@ -1,4 +1,4 @@
-from FuzzyClasses import FuzzyVariable, FuzzyRule
+from FuzzyClasses import FuzzyVariable, FuzzyRule, FuzzyTerm
 
 class FuzzySystem:
     """
@@ -21,6 +21,11 @@ class FuzzySystem:
         A dictionary to store fuzzy variables.
     rules: list
         A list to store fuzzy rules.
+    rule_order: list or None
+        The rules in the order their strengths are aggregated, with a merged rule
+        at each of its original positions, or None if the rules were never merged.
+    restrict_range: bool
+        Whether crisp values outside the range of their variable are rejected.
 
     Methods:
     --------
@@ -33,6 +38,9 @@ class FuzzySystem:
     add_rule(antecedent, consequent)
         Adds a fuzzy rule to the system.
 
+    optimize_rules()
+        Removes redundant and dead rules and factors out shared sub-expressions.
+
     run_simulation(crisp_values)
         Runs the simulation using crisp input values.
 
@@ -50,6 +58,8 @@ class FuzzySystem:
         self.description = description
         self.variables = {}
         self.rules = []
+        self.rule_order = None
+        self.restrict_range = False
 
     def add_variable(self, name, v_type, v_range):
         """
@@ -101,6 +111,287 @@ class FuzzySystem:
         """
         rule = FuzzyRule(antecedent, consequent)
         self.rules.append(rule)
+        if self.rule_order is not None:
+            self.rule_order.append(rule)
+
+    def optimize_rules(self):
+        """
+        Removes redundant and dead rules and factors out shared "and" sub-expressions.
+
+        Identical rules are merged into one weighted rule that is evaluated once
+        and aggregated at each of its original positions, and every "and" of two
+        terms used more than once is evaluated once per inference.
+        Rules that can never fire for crisp values inside the variables' ranges
+        are removed; as they may fire outside them, the system then rejects
+        crisp values outside the ranges (see restrict_range).
+        Rules dominated by another rule with the same consequent are only
+        reported, as their strength still counts in the defuzzification.
+
+        Returns:
+        --------
+        report: dict
+            The merged ('duplicate'), removed ('dead') and dominated rule numbers,
+            and the shared sub-expressions with their number of uses ('shared').
+        """
+        report = {'duplicate': [], 'dead': [], 'dominated': [], 'shared': []}
+        numbers = {rule: i for i, rule in enumerate(self.rules, 1)}
+
+        # merge identical rules, whatever the order of their "and" operands
+        merged = {}
+        canonical = {}
+        for rule in self.rules:
+            key = (self._rule_key(rule.antecedent), rule.consequent)
+            if key in merged:
+                merged[key].weight += rule.weight
+                report['duplicate'].append(numbers[rule])
+            else:
+                merged[key] = rule
+            canonical[rule] = merged[key]
+        rules = list(merged.values())
+
+        # remove the rules that are always zero, keeping the first of each consequent
+        kept = []
+        for rule in rules:
+            dead = self._bounds(rule.antecedent)[1] == 0
+            if dead and any(k.consequent == rule.consequent for k in kept):
+                report['dead'].append(numbers[rule])
+                self.restrict_range = True
+            else:
+                kept.append(rule)
+        rules = kept
+
+        # a dead rule only ever adds a zero strength, so it can leave the order
+        kept = set(rules)
+        self.rule_order = [canonical[rule] for rule in (self.rule_order or self.rules)
+                           if canonical[rule] in kept]
+
+        # report the rules that never exceed another rule with the same consequent
+        conjunctions = {}
+        for rule in rules:
+            terms = self._conjuncts(rule.antecedent)
+            if terms is not None:
+                conjunctions.setdefault(rule.consequent, []).append((rule, terms))
+        for group in conjunctions.values():
+            for rule, terms in group:
+                for other, other_terms in group:
+                    if other_terms < terms:
+                        report['dominated'].append((numbers[rule], numbers[other]))
+                        break
+
+        # factor out the "and" sub-expressions used more than once
+        uses = {}
+        for rule in rules:
+            for start, mid, end in self._and_windows(rule.antecedent):
+                key = self._term_key(rule.antecedent, start, mid, end)
+                uses[key] = uses.get(key, 0) + 1
+        terms = {}
+        for rule in rules:
+            antec = rule.antecedent.copy()
+            for start, mid, end in reversed(self._and_windows(antec)):
+                key = self._term_key(antec, start, mid, end)
+                if uses[key] < 2:
+                    continue
+                if key not in terms:
+                    terms[key] = FuzzyTerm(antec[start:end])
+                    report['shared'].append((self._describe(antec[start:end]), uses[key]))
+                antec[start:end] = [terms[key]]
+            rule.antecedent = antec
+
+        self.rules = rules
+        return report
+
+    def _is_dead(self, variable_name, set_name):
+        """
+        Checks whether a fuzzy set is zero over the whole range of its variable.
+
+        Parameters:
+        -----------
+        variable_name: str
+            The name of the fuzzy variable.
+        set_name: str
+            The name of the fuzzy set.
+
+        Returns:
+        --------
+        dead: bool
+            True if the membership value is always zero, False otherwise.
+        """
+        variable = self.variables.get(variable_name)
+        fuzzy_set = variable.get_fuzzy_set(set_name) if variable else None
+        if fuzzy_set is None or list(fuzzy_set.values) != sorted(fuzzy_set.values):
+            return False
+        lower, upper = variable.range
+        first, last = fuzzy_set.values[0], fuzzy_set.values[-1]
+        return first >= upper or last <= lower or first == last
+
+    def _bounds(self, antecedent):
+        """
+        Computes the lower and upper bounds of the strength of an antecedent.
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        bounds: tuple
+            The lowest and highest possible strength.
+        """
+        antec = antecedent.copy()
+        for i in range(0, len(antec)):
+            if isinstance(antec[i], tuple):
+                antec[i] = (0, 0) if self._is_dead(*antec[i]) else (0, 1)
+            elif isinstance(antec[i], FuzzyTerm):
+                antec[i] = self._bounds(antec[i].antecedent)
+
+        antec = self._not(antec, lambda b: (1 - b[1], 1 - b[0]))
+        antec = self._and(antec, lambda l, r: (min(l[0], r[0]), min(l[1], r[1])))
+        antec = self._or(antec, lambda l, r: (max(l[0], r[0]), max(l[1], r[1])))
+        return antec[0]
+
+    def _operands(self, antecedent):
+        """
+        Splits an antecedent into its operators and operands.
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        items: list
+            The operators, and the (start, end) span of each operand with its "not".
+        """
+        items = []
+        i = 0
+        while i < len(antecedent):
+            if isinstance(antecedent[i], str) and antecedent[i] == 'not':
+                items.append((i, i + 2))
+                i += 2
+            elif isinstance(antecedent[i], str):
+                items.append(antecedent[i])
+                i += 1
+            else:
+                items.append((i, i + 1))
+                i += 1
+        return items
+
+    def _conjuncts(self, antecedent):
+        """
+        Retrieves the operands of an antecedent made of one operand or a single "and".
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        conjuncts: frozenset or None
+            The operands if the antecedent is a conjunction, None otherwise.
+        """
+        items = self._operands(antecedent)
+        if len(items) == 1 and isinstance(items[0], tuple):
+            spans = items
+        elif len(items) == 3 and items[1] == 'and':
+            spans = [items[0], items[2]]
+        else:
+            return None
+        return frozenset(tuple(antecedent[start:end]) for start, end in spans)
+
+    def _and_windows(self, antecedent):
+        """
+        Finds the "and" operations whose operands are not shared with another "and".
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        windows: list
+            The (start, operator, end) indices of each "and" operation.
+        """
+        items = self._operands(antecedent)
+        windows = []
+        for j in range(1, len(items) - 1):
+            if (items[j] == 'and' and isinstance(items[j - 1], tuple) and isinstance(items[j + 1], tuple)
+                    and (j < 2 or items[j - 2] != 'and')
+                    and (j + 2 >= len(items) or items[j + 2] != 'and')):
+                windows.append((items[j - 1][0], items[j - 1][1], items[j + 1][1]))
+        return windows
+
+    def _rule_key(self, antecedent):
+        """
+        Computes a key identifying an antecedent regardless of its "and" operands' order.
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        key: tuple
+            The antecedent with each "and" operation replaced by its key.
+        """
+        key = list(antecedent)
+        for start, mid, end in reversed(self._and_windows(antecedent)):
+            key[start:end] = [('and', self._term_key(antecedent, start, mid, end))]
+        return tuple(key)
+
+    def _term_key(self, antecedent, start, mid, end):
+        """
+        Computes a key identifying an "and" operation regardless of its operands' order.
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+        start, mid, end: int
+            The indices of the first operand, the operator and the end of the operation.
+
+        Returns:
+        --------
+        key: tuple
+            The operands of the operation in a fixed order.
+        """
+        operands = (tuple(antecedent[start:mid]), tuple(antecedent[mid + 1:end]))
+        return tuple(sorted(operands, key=repr))
+
+    def _describe(self, antecedent):
+        """
+        Formats an antecedent the way it is entered.
+
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+
+        Returns:
+        --------
+        description: str
+            The formatted antecedent.
+        """
+        words = []
+        negate = False
+        for token in antecedent:
+            if isinstance(token, str) and token == 'not':
+                negate = True
+            elif isinstance(token, tuple):
+                v_name, v_set = token
+                words.extend((v_name, 'not', v_set) if negate else token)
+                negate = False
+            elif isinstance(token, FuzzyTerm):
+                words.extend(('not',) if negate else ())
+                words.append(f"({self._describe(token.antecedent)})")
+                negate = False
+            else:
+                words.append(token)
+        return ' '.join(words)
 
     def run_simulation(self, crisp_values):
         """
@@ -140,11 +431,19 @@ class FuzzySystem:
         --------
         fuzzy_values: dict
             A dictionary of fuzzy values for each variable and fuzzy set.
+
+        Raises:
+        -------
+        ValueError
+            If restrict_range is set and a crisp value is outside the range of its variable.
         """
         fuzzy_values = {}
         for variable_name, value in crisp_values.items():
             variable = self.variables.get(variable_name)
             if variable:
+                lower, upper = variable.range
+                if self.restrict_range and not lower <= value <= upper:
+                    raise ValueError(f"{variable_name} must be within [{lower}, {upper}].")
                 fuzzy_values[variable_name] = {}
                 for set_name, fuzzy_set in variable.fuzzy_sets.items():
                     fuzzy_values[variable_name][set_name] = self._membership(value, fuzzy_set)
@@ -236,24 +535,53 @@ class FuzzySystem:
             A list of rule strengths and their consequents.
         """
         rule_strengths = []
-        for rule in self.rules:
-            antec = rule.antecedent.copy()
+        strengths = {}
+        shared_strengths = {}
+        for rule in self.rules if self.rule_order is None else self.rule_order:
+            if rule not in strengths:
+                strengths[rule] = self._evaluate(rule.antecedent, fuzzy_values, shared_strengths)
+
+            # add the rule strength and the consequent at each of the rule's positions
+            rule_strengths.append((strengths[rule], rule.consequent))
+        return rule_strengths
 
-            # replace fuzzy set names with their strengths
-            for i in range(0, len(antec)):
-                if isinstance(antec[i], tuple):
-                    v_name, v_set = antec[i]
-                    antecedent_strength = fuzzy_values[v_name][v_set]
-                    antec[i] = antecedent_strength
+    def _evaluate(self, antecedent, fuzzy_values, shared_strengths):
+        """
+        Computes the strength of an antecedent.
 
-            # evaluate the antecedent
-            antec = self._not(antec)
-            antec = self._and(antec)
-            antec = self._or(antec)
+        Parameters:
+        -----------
+        antecedent: list
+            The antecedent of the fuzzy rule.
+        fuzzy_values: dict
+            A dictionary of fuzzy values for each variable and fuzzy set.
+        shared_strengths: dict
+            The strengths of the shared terms evaluated so far.
 
-            # add the rule strength and the consequent
-            rule_strengths.append((antec[0], rule.consequent))
-        return rule_strengths
+        Returns:
+        --------
+        strength: float
+            The strength of the antecedent.
+        """
+        antec = antecedent.copy()
+
+        # replace fuzzy set names and shared terms with their strengths
+        for i in range(0, len(antec)):
+            if isinstance(antec[i], tuple):
+                v_name, v_set = antec[i]
+                antecedent_strength = fuzzy_values[v_name][v_set]
+                antec[i] = antecedent_strength
+            elif isinstance(antec[i], FuzzyTerm):
+                term = antec[i]
+                if term not in shared_strengths:
+                    shared_strengths[term] = self._evaluate(term.antecedent, fuzzy_values, shared_strengths)
+                antec[i] = shared_strengths[term]
+
+        # evaluate the antecedent
+        antec = self._not(antec)
+        antec = self._and(antec)
+        antec = self._or(antec)
+        return antec[0]
 
     def defuzzification(self, rule_strengths):
         """
@@ -315,7 +643,7 @@ class FuzzySystem:
             output.append((abs(value - result), key))
         return min(output)[1]
 
-    def _not(self, antec):
+    def _not(self, antec, op=lambda x: 1 - x):
         """
         Performs the "not" operation on the antecedent.
 
@@ -323,6 +651,8 @@ class FuzzySystem:
         -----------
         antec: list
             The antecedent list.
+        op: callable
+            The function computing the "not" of its operands.
 
         Returns:
         --------
@@ -332,7 +662,7 @@ class FuzzySystem:
         ind = []
         for i in range(0, len(antec)):
             if isinstance(antec[i], str) and antec[i] == 'not':
-                antec[i] = 1 - antec[i + 1]
+                antec[i] = op(antec[i + 1])
                 ind.append(i + 1)
 
         # remove the evaluated values
@@ -340,7 +670,7 @@ class FuzzySystem:
             del antec[i]
         return antec
 
-    def _and(self, antec):
+    def _and(self, antec, op=min):
         """
         Performs the "and" operation on the antecedent.
 
@@ -348,6 +678,8 @@ class FuzzySystem:
         -----------
         antec: list
             The antecedent list.
+        op: callable
+            The function computing the "and" of its operands.
 
         Returns:
         --------
@@ -357,7 +689,7 @@ class FuzzySystem:
         ind = []
         for i in range(0, len(antec)):
             if isinstance(antec[i], str) and antec[i] == 'and':
-                antec[i] = min(antec[i - 1], antec[i + 1])
+                antec[i] = op(antec[i - 1], antec[i + 1])
                 ind.extend((i - 1, i + 1))
 
         # remove the evaluated values
@@ -365,7 +697,7 @@ class FuzzySystem:
             del antec[i]
         return antec
 
-    def _or(self, antec):
+    def _or(self, antec, op=max):
         """
         Performs the "or" operation on the antecedent.
 
@@ -373,6 +705,8 @@ class FuzzySystem:
         -----------
         antec: list
             The antecedent list.
+        op: callable
+            The function computing the "or" of its operands.
 
         Returns:
         --------
@@ -382,7 +716,7 @@ class FuzzySystem:
         ind = []
         for i in range(0, len(antec)):
             if isinstance(antec[i], str) and antec[i] == 'or':
-                antec[i] = max(antec[i - 1], antec[i + 1])
+                antec[i] = op(antec[i - 1], antec[i + 1])
                 ind.extend((i - 1, i + 1))
 
         # remove the evaluated values
@@ -0,0 +1,134 @@
+import copy
+import unittest
+
+from FuzzySystem import FuzzySystem
+
+
+def example_system():
+    """
+    Builds the wash time estimation system of example.txt.
+    """
+    fuzzy_system = FuzzySystem("Wash Time Estimation", "The problem is to estimate the wash time .")
+    fuzzy_system.add_variable('dirt', 'IN', (0, 100))
+    fuzzy_system.add_variable('softness', 'IN', (0, 100))
+    fuzzy_system.add_variable('time', 'OUT', (0, 60))
+    fuzzy_system.add_fuzzy_set('dirt', 'small', 'TRAP', (0, 0, 20, 40))
+    fuzzy_system.add_fuzzy_set('dirt', 'medium', 'TRAP', (20, 40, 60, 80))
+    fuzzy_system.add_fuzzy_set('dirt', 'large', 'TRAP', (60, 80, 100, 100))
+    fuzzy_system.add_fuzzy_set('softness', 'soft', 'TRAP', (0, 0, 20, 40))
+    fuzzy_system.add_fuzzy_set('softness', 'ordinary', 'TRAP', (20, 40, 60, 80))
+    fuzzy_system.add_fuzzy_set('softness', 'stiff', 'TRAP', (60, 80, 100, 100))
+    fuzzy_system.add_fuzzy_set('time', 'very_small', 'TRI', (0, 0, 15))
+    fuzzy_system.add_fuzzy_set('time', 'small', 'TRI', (0, 15, 30))
+    fuzzy_system.add_fuzzy_set('time', 'standard', 'TRI', (15, 30, 45))
+    fuzzy_system.add_fuzzy_set('time', 'large', 'TRI', (30, 45, 60))
+    fuzzy_system.add_fuzzy_set('time', 'very_large', 'TRI', (45, 60, 60))
+    fuzzy_system.add_rule([('dirt', 'small'), 'and', ('softness', 'soft')], ('time', 'very_small'))
+    fuzzy_system.add_rule([('dirt', 'medium'), 'and', ('softness', 'ordinary')], ('time', 'standard'))
+    fuzzy_system.add_rule([('dirt', 'small'), 'and', 'not', ('softness', 'soft'), 'or',
+                           ('dirt', 'medium'), 'and', ('softness', 'soft')], ('time', 'small'))
+    fuzzy_system.add_rule([('dirt', 'medium'), 'and', ('softness', 'stiff')], ('time', 'large'))
+    fuzzy_system.add_rule([('dirt', 'large'), 'and', 'not', ('softness', 'soft')], ('time', 'very_large'))
+    fuzzy_system.add_rule([('dirt', 'large'), 'and', ('softness', 'soft')], ('time', 'standard'))
+    return fuzzy_system
+
+
+def simulate(fuzzy_system, crisp_values):
+    """
+    Runs the three simulation steps without printing.
+    """
+    try:
+        fuzzy_values = fuzzy_system.fuzzification(crisp_values)
+        return fuzzy_system.defuzzification(fuzzy_system.inference(fuzzy_values))
+    except ZeroDivisionError as e:
+        return type(e)
+
+
+class OptimizeRulesTest(unittest.TestCase):
+
+    def assertSameOutputs(self, original, optimized):
+        for dirt in range(0, 101, 5):
+            for softness in range(0, 101, 5):
+                crisp_values = {'dirt': dirt, 'softness': softness}
+                self.assertEqual(simulate(original, crisp_values), simulate(optimized, crisp_values),
+                                 crisp_values)
+
+    def optimize(self, original):
+        optimized = copy.deepcopy(original)
+        report = optimized.optimize_rules()
+        self.assertSameOutputs(original, optimized)
+        return optimized, report
+
+    def test_example(self):
+        optimized, report = self.optimize(example_system())
+        self.assertEqual(report['duplicate'], [])
+        self.assertEqual(report['dead'], [])
+        self.assertEqual(len(optimized.rules), 6)
+
+    def test_duplicates(self):
+        original = example_system()
+        original.add_rule([('dirt', 'small'), 'and', ('softness', 'soft')], ('time', 'very_small'))
+        original.add_rule([('softness', 'soft'), 'and', ('dirt', 'small')], ('time', 'very_small'))
+        original.add_rule(['not', ('softness', 'soft'), 'and', ('dirt', 'small'), 'or',
+                           ('softness', 'soft'), 'and', ('dirt', 'medium')], ('time', 'small'))
+        optimized, report = self.optimize(original)
+        self.assertEqual(report['duplicate'], [7, 8, 9])
+        self.assertEqual(report['dominated'], [])
+        self.assertEqual(optimized.rules[0].weight, 3)
+        self.assertEqual(optimized.rules[2].weight, 2)
+
+        # a second pass finds nothing more to do
+        again = copy.deepcopy(optimized)
+        report = again.optimize_rules()
+        self.assertEqual(report, {'duplicate': [], 'dead': [], 'dominated': [], 'shared': []})
+        self.assertSameOutputs(optimized, again)
+
+    def test_dead_rules(self):
+        original = example_system()
+        original.add_fuzzy_set('dirt', 'dead', 'TRI', (120, 130, 140))
+        original.add_rule([('dirt', 'dead')], ('time', 'very_small'))
+        original.add_rule([('dirt', 'dead'), 'or', ('softness', 'stiff')], ('time', 'large'))
+        original.add_rule([('dirt', 'dead'), 'and', 'not', ('softness', 'soft')], ('time', 'very_large'))
+        optimized, report = self.optimize(original)
+        self.assertEqual(report['dead'], [7, 9])
+        self.assertEqual(len(optimized.rules), 7)
+
+    def test_dead_rule_out_of_range(self):
+        original = FuzzySystem("Dead", "A rule that only fires out of range")
+        original.add_variable('dirt', 'IN', (0, 100))
+        original.add_variable('time', 'OUT', (0, 60))
+        original.add_fuzzy_set('dirt', 'small', 'TRAP', (0, 0, 20, 40))
+        original.add_fuzzy_set('dirt', 'dead', 'TRI', (120, 130, 140))
+        original.add_fuzzy_set('dirt', 'large', 'TRAP', (60, 80, 100, 100))
+        original.add_fuzzy_set('time', 'vs', 'TRI', (0, 0, 15))
+        original.add_fuzzy_set('time', 'vl', 'TRI', (45, 60, 60))
+        original.add_rule([('dirt', 'small')], ('time', 'vs'))
+        original.add_rule([('dirt', 'dead')], ('time', 'vs'))
+        original.add_rule([('dirt', 'large')], ('time', 'vl'))
+        optimized = copy.deepcopy(original)
+        self.assertEqual(optimized.optimize_rules()['dead'], [2])
+        for dirt in range(0, 101):
+            self.assertEqual(simulate(original, {'dirt': dirt}), simulate(optimized, {'dirt': dirt}))
+        self.assertEqual(simulate(original, {'dirt': 130}), ('time', 'vs', 5.0))
+        with self.assertRaises(ValueError):
+            optimized.fuzzification({'dirt': 130})
+
+    def test_merged_rules_keep_their_positions(self):
+        original = example_system()
+        original.add_rule([('dirt', 'medium'), 'and', ('softness', 'ordinary')], ('time', 'standard'))
+        original.add_rule([('dirt', 'small'), 'and', ('softness', 'soft')], ('time', 'very_small'))
+        optimized, report = self.optimize(original)
+        crisp_values = {'dirt': 30, 'softness': 30}
+        self.assertEqual(optimized.inference(optimized.fuzzification(crisp_values)),
+                         original.inference(original.fuzzification(crisp_values)))
+
+    def test_shared_terms(self):
+        original = example_system()
+        original.add_rule([('dirt', 'medium'), 'and', ('softness', 'soft'), 'or',
+                           ('softness', 'soft'), 'and', ('dirt', 'medium')], ('time', 'standard'))
+        optimized, report = self.optimize(original)
+        self.assertEqual(report['shared'], [('dirt medium and softness soft', 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()